@@ -5,71 +5,277 @@ Converts EPUB files to Bionic Reading format with bold word beginnings.
 Cross-platform GUI application (Windows/Linux)
 """
 
+import codecs
+import collections
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import itertools
 import os
+import re
+import shutil
 import sys
-import regex
 import zipfile
 import threading
+import time
+import unicodedata
 from pathlib import Path
-from bs4 import BeautifulSoup
+from lxml import etree
 
 # GUI imports
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+# Combining marks (accents, Indic vowel signs, ...) are not matched by \w,
+# but belong to the word they follow. Ranges of Unicode category M (Unicode 14.0),
+# precomputed so import does not scan every code point.
+COMBINING_MARK_RANGES = (
+    (0x0300, 0x036F), (0x0483, 0x0489), (0x0591, 0x05BD), (0x05BF, 0x05BF), (0x05C1, 0x05C2),
+    (0x05C4, 0x05C5), (0x05C7, 0x05C7), (0x0610, 0x061A), (0x064B, 0x065F), (0x0670, 0x0670),
+    (0x06D6, 0x06DC), (0x06DF, 0x06E4), (0x06E7, 0x06E8), (0x06EA, 0x06ED), (0x0711, 0x0711),
+    (0x0730, 0x074A), (0x07A6, 0x07B0), (0x07EB, 0x07F3), (0x07FD, 0x07FD), (0x0816, 0x0819),
+    (0x081B, 0x0823), (0x0825, 0x0827), (0x0829, 0x082D), (0x0859, 0x085B), (0x0898, 0x089F),
+    (0x08CA, 0x08E1), (0x08E3, 0x0903), (0x093A, 0x093C), (0x093E, 0x094F), (0x0951, 0x0957),
+    (0x0962, 0x0963), (0x0981, 0x0983), (0x09BC, 0x09BC), (0x09BE, 0x09C4), (0x09C7, 0x09C8),
+    (0x09CB, 0x09CD), (0x09D7, 0x09D7), (0x09E2, 0x09E3), (0x09FE, 0x09FE), (0x0A01, 0x0A03),
+    (0x0A3C, 0x0A3C), (0x0A3E, 0x0A42), (0x0A47, 0x0A48), (0x0A4B, 0x0A4D), (0x0A51, 0x0A51),
+    (0x0A70, 0x0A71), (0x0A75, 0x0A75), (0x0A81, 0x0A83), (0x0ABC, 0x0ABC), (0x0ABE, 0x0AC5),
+    (0x0AC7, 0x0AC9), (0x0ACB, 0x0ACD), (0x0AE2, 0x0AE3), (0x0AFA, 0x0AFF), (0x0B01, 0x0B03),
+    (0x0B3C, 0x0B3C), (0x0B3E, 0x0B44), (0x0B47, 0x0B48), (0x0B4B, 0x0B4D), (0x0B55, 0x0B57),
+    (0x0B62, 0x0B63), (0x0B82, 0x0B82), (0x0BBE, 0x0BC2), (0x0BC6, 0x0BC8), (0x0BCA, 0x0BCD),
+    (0x0BD7, 0x0BD7), (0x0C00, 0x0C04), (0x0C3C, 0x0C3C), (0x0C3E, 0x0C44), (0x0C46, 0x0C48),
+    (0x0C4A, 0x0C4D), (0x0C55, 0x0C56), (0x0C62, 0x0C63), (0x0C81, 0x0C83), (0x0CBC, 0x0CBC),
+    (0x0CBE, 0x0CC4), (0x0CC6, 0x0CC8), (0x0CCA, 0x0CCD), (0x0CD5, 0x0CD6), (0x0CE2, 0x0CE3),
+    (0x0D00, 0x0D03), (0x0D3B, 0x0D3C), (0x0D3E, 0x0D44), (0x0D46, 0x0D48), (0x0D4A, 0x0D4D),
+    (0x0D57, 0x0D57), (0x0D62, 0x0D63), (0x0D81, 0x0D83), (0x0DCA, 0x0DCA), (0x0DCF, 0x0DD4),
+    (0x0DD6, 0x0DD6), (0x0DD8, 0x0DDF), (0x0DF2, 0x0DF3), (0x0E31, 0x0E31), (0x0E34, 0x0E3A),
+    (0x0E47, 0x0E4E), (0x0EB1, 0x0EB1), (0x0EB4, 0x0EBC), (0x0EC8, 0x0ECD), (0x0F18, 0x0F19),
+    (0x0F35, 0x0F35), (0x0F37, 0x0F37), (0x0F39, 0x0F39), (0x0F3E, 0x0F3F), (0x0F71, 0x0F84),
+    (0x0F86, 0x0F87), (0x0F8D, 0x0F97), (0x0F99, 0x0FBC), (0x0FC6, 0x0FC6), (0x102B, 0x103E),
+    (0x1056, 0x1059), (0x105E, 0x1060), (0x1062, 0x1064), (0x1067, 0x106D), (0x1071, 0x1074),
+    (0x1082, 0x108D), (0x108F, 0x108F), (0x109A, 0x109D), (0x135D, 0x135F), (0x1712, 0x1715),
+    (0x1732, 0x1734), (0x1752, 0x1753), (0x1772, 0x1773), (0x17B4, 0x17D3), (0x17DD, 0x17DD),
+    (0x180B, 0x180D), (0x180F, 0x180F), (0x1885, 0x1886), (0x18A9, 0x18A9), (0x1920, 0x192B),
+    (0x1930, 0x193B), (0x1A17, 0x1A1B), (0x1A55, 0x1A5E), (0x1A60, 0x1A7C), (0x1A7F, 0x1A7F),
+    (0x1AB0, 0x1ACE), (0x1B00, 0x1B04), (0x1B34, 0x1B44), (0x1B6B, 0x1B73), (0x1B80, 0x1B82),
+    (0x1BA1, 0x1BAD), (0x1BE6, 0x1BF3), (0x1C24, 0x1C37), (0x1CD0, 0x1CD2), (0x1CD4, 0x1CE8),
+    (0x1CED, 0x1CED), (0x1CF4, 0x1CF4), (0x1CF7, 0x1CF9), (0x1DC0, 0x1DFF), (0x20D0, 0x20F0),
+    (0x2CEF, 0x2CF1), (0x2D7F, 0x2D7F), (0x2DE0, 0x2DFF), (0x302A, 0x302F), (0x3099, 0x309A),
+    (0xA66F, 0xA672), (0xA674, 0xA67D), (0xA69E, 0xA69F), (0xA6F0, 0xA6F1), (0xA802, 0xA802),
+    (0xA806, 0xA806), (0xA80B, 0xA80B), (0xA823, 0xA827), (0xA82C, 0xA82C), (0xA880, 0xA881),
+    (0xA8B4, 0xA8C5), (0xA8E0, 0xA8F1), (0xA8FF, 0xA8FF), (0xA926, 0xA92D), (0xA947, 0xA953),
+    (0xA980, 0xA983), (0xA9B3, 0xA9C0), (0xA9E5, 0xA9E5), (0xAA29, 0xAA36), (0xAA43, 0xAA43),
+    (0xAA4C, 0xAA4D), (0xAA7B, 0xAA7D), (0xAAB0, 0xAAB0), (0xAAB2, 0xAAB4), (0xAAB7, 0xAAB8),
+    (0xAABE, 0xAABF), (0xAAC1, 0xAAC1), (0xAAEB, 0xAAEF), (0xAAF5, 0xAAF6), (0xABE3, 0xABEA),
+    (0xABEC, 0xABED), (0xFB1E, 0xFB1E), (0xFE00, 0xFE0F), (0xFE20, 0xFE2F), (0x101FD, 0x101FD),
+    (0x102E0, 0x102E0), (0x10376, 0x1037A), (0x10A01, 0x10A03), (0x10A05, 0x10A06),
+    (0x10A0C, 0x10A0F), (0x10A38, 0x10A3A), (0x10A3F, 0x10A3F), (0x10AE5, 0x10AE6),
+    (0x10D24, 0x10D27), (0x10EAB, 0x10EAC), (0x10F46, 0x10F50), (0x10F82, 0x10F85),
+    (0x11000, 0x11002), (0x11038, 0x11046), (0x11070, 0x11070), (0x11073, 0x11074),
+    (0x1107F, 0x11082), (0x110B0, 0x110BA), (0x110C2, 0x110C2), (0x11100, 0x11102),
+    (0x11127, 0x11134), (0x11145, 0x11146), (0x11173, 0x11173), (0x11180, 0x11182),
+    (0x111B3, 0x111C0), (0x111C9, 0x111CC), (0x111CE, 0x111CF), (0x1122C, 0x11237),
+    (0x1123E, 0x1123E), (0x112DF, 0x112EA), (0x11300, 0x11303), (0x1133B, 0x1133C),
+    (0x1133E, 0x11344), (0x11347, 0x11348), (0x1134B, 0x1134D), (0x11357, 0x11357),
+    (0x11362, 0x11363), (0x11366, 0x1136C), (0x11370, 0x11374), (0x11435, 0x11446),
+    (0x1145E, 0x1145E), (0x114B0, 0x114C3), (0x115AF, 0x115B5), (0x115B8, 0x115C0),
+    (0x115DC, 0x115DD), (0x11630, 0x11640), (0x116AB, 0x116B7), (0x1171D, 0x1172B),
+    (0x1182C, 0x1183A), (0x11930, 0x11935), (0x11937, 0x11938), (0x1193B, 0x1193E),
+    (0x11940, 0x11940), (0x11942, 0x11943), (0x119D1, 0x119D7), (0x119DA, 0x119E0),
+    (0x119E4, 0x119E4), (0x11A01, 0x11A0A), (0x11A33, 0x11A39), (0x11A3B, 0x11A3E),
+    (0x11A47, 0x11A47), (0x11A51, 0x11A5B), (0x11A8A, 0x11A99), (0x11C2F, 0x11C36),
+    (0x11C38, 0x11C3F), (0x11C92, 0x11CA7), (0x11CA9, 0x11CB6), (0x11D31, 0x11D36),
+    (0x11D3A, 0x11D3A), (0x11D3C, 0x11D3D), (0x11D3F, 0x11D45), (0x11D47, 0x11D47),
+    (0x11D8A, 0x11D8E), (0x11D90, 0x11D91), (0x11D93, 0x11D97), (0x11EF3, 0x11EF6),
+    (0x16AF0, 0x16AF4), (0x16B30, 0x16B36), (0x16F4F, 0x16F4F), (0x16F51, 0x16F87),
+    (0x16F8F, 0x16F92), (0x16FE4, 0x16FE4), (0x16FF0, 0x16FF1), (0x1BC9D, 0x1BC9E),
+    (0x1CF00, 0x1CF2D), (0x1CF30, 0x1CF46), (0x1D165, 0x1D169), (0x1D16D, 0x1D172),
+    (0x1D17B, 0x1D182), (0x1D185, 0x1D18B), (0x1D1AA, 0x1D1AD), (0x1D242, 0x1D244),
+    (0x1DA00, 0x1DA36), (0x1DA3B, 0x1DA6C), (0x1DA75, 0x1DA75), (0x1DA84, 0x1DA84),
+    (0x1DA9B, 0x1DA9F), (0x1DAA1, 0x1DAAF), (0x1E000, 0x1E006), (0x1E008, 0x1E018),
+    (0x1E01B, 0x1E021), (0x1E023, 0x1E024), (0x1E026, 0x1E02A), (0x1E130, 0x1E136),
+    (0x1E2AE, 0x1E2AE), (0x1E2EC, 0x1E2EF), (0x1E8D0, 0x1E8D6), (0x1E944, 0x1E94A),
+    (0xE0100, 0xE01EF),
+)
+# Character class body ('a-b' ranges) for use inside [...]
+COMBINING_MARKS = ''.join(f'{chr(start)}-{chr(end)}' for start, end in COMBINING_MARK_RANGES)
+
+# Connector punctuation besides '_' ('‿', '＿', ...); it joins letters into a single
+# run that is then left alone, like '_' in \w
+CONNECTOR_PUNCTUATION = '\u203f\u2040\u2054\ufe33\ufe34\ufe4d-\ufe4f\uff3f'
+
+
+class ThreadParsers(threading.local):
+    """lxml parsers and text XPath reused across documents, one set per thread."""
+    
+    def __init__(self, text_xpath: str):
+        # Compiled XPath objects serialize their evaluations behind a lock
+        self.text_xpath = etree.XPath(text_xpath)
+        self.xml = etree.XMLParser(recover=True, remove_blank_text=False, huge_tree=True)
+        # libxml2 honours a <meta> charset; without one it would assume Latin-1
+        self.html = etree.HTMLParser(recover=True)
+        self.html_utf8 = etree.HTMLParser(recover=True, encoding='utf-8')
+
 
 class BionicConverter:
     """Core conversion logic for Bionic Reading format."""
     
     SKIP_TAGS = {'script', 'style', 'pre', 'code', 'svg', 'math'}
     HTML_EXTENSIONS = ('.html', '.xhtml', '.htm')
+    MAX_PENDING_FILES = 16
+    COPY_CHUNK_SIZE = 64 * 1024
+    PROGRESS_INTERVAL = 1 / 30  # seconds
+    # The capturing group makes split() alternate separators and words
+    WORD_PATTERN = re.compile(f'([\\w{COMBINING_MARKS}{CONNECTOR_PUNCTUATION}]+)')
+    # Pure ASCII text needs no Unicode category lookups
+    ASCII_WORD_PATTERN = re.compile(r'(\w+)', re.ASCII)
+    # An actual <meta charset> / <meta http-equiv content="...; charset=..."> declaration
+    META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset', re.IGNORECASE)
+    # Bold prefix length for words up to nine letters, indexed by length;
+    # longer words bold half their length
+    BOLD_LENGTHS = (0, 0, 1, 1, 2, 2, 2, 3, 3, 3)
+    # Non-blank text nodes outside SKIP_TAGS, selected in a single XPath call
+    TEXT_XPATH = '//text()[normalize-space()][not(ancestor::*[{}])]'.format(
+        ' or '.join(f'local-name()="{tag}"' for tag in sorted(SKIP_TAGS))
+    )
     
     def __init__(self, progress_callback=None):
         self.progress_callback = progress_callback
-        self.word_pattern = regex.compile(r'\b[\p{L}\p{M}]+\b', regex.UNICODE)
+        self.parsers = ThreadParsers(self.TEXT_XPATH)
+        # Converted documents that may repeat within the book, by (CRC, size) group
+        # and then by a digest of their source; shared by all workers
+        self._html_cache = {}
+        self._html_cache_remaining = collections.Counter()
+        self._html_cache_lock = threading.Lock()
     
-    def bionic_word(self, word: str) -> str:
-        """Convert a word to bionic format with bold beginning."""
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def bionic_word(word: str) -> tuple[str, str]:
+        """Split a word into its bold beginning and the rest."""
+        # Runs containing numerals (digits, '²', 'Ⅻ', ...) or connector
+        # punctuation ('_', ...) are not words
+        if not all(unicodedata.category(char)[0] in 'LM' for char in word):
+            return '', word
         length = len(word)
-        if length <= 1:
-            return word
-        elif length <= 3:
-            bold_len = 1
-        elif length <= 6:
-            bold_len = 2
-        elif length <= 9:
-            bold_len = 3
-        else:
-            bold_len = length // 2
+        bold_lengths = BionicConverter.BOLD_LENGTHS
+        bold_len = bold_lengths[length] if length < len(bold_lengths) else length >> 1
         
-        return f"<b>{word[:bold_len]}</b>{word[bold_len:]}"
+        return word[:bold_len], word[bold_len:]
     
-    def process_text(self, text: str) -> str:
-        """Process text and apply bionic formatting to words."""
-        if not text or not text.strip():
-            return text
-        return self.word_pattern.sub(lambda m: self.bionic_word(m.group(0)), text)
+    def process_text(self, text: str) -> tuple[str, list[list[str]]]:
+        """
+        Split text into bionic pieces.
+        Returns (leading text, [[bold text, tail text], ...]) with one pair per bolded word.
+        """
+        if text.isascii():
+            parts = self.ASCII_WORD_PATTERN.split(text)
+        else:
+            parts = self.WORD_PATTERN.split(text)
+        lead = parts[0]
+        pieces = []
+        for i in range(1, len(parts), 2):
+            bold, rest = self.bionic_word(parts[i])
+            if bold:
+                pieces.append([bold, rest + parts[i + 1]])
+            elif pieces:
+                pieces[-1][1] += parts[i] + parts[i + 1]
+            else:
+                lead += parts[i] + parts[i + 1]
+        return lead, pieces
     
     def process_html_content(self, content: bytes) -> bytes:
         """Process HTML/XHTML content and apply bionic formatting."""
-        try:
-            # Try parsing as XML first (better for XHTML)
-            soup = BeautifulSoup(content, 'xml')
-        except Exception:
-            # Fall back to lxml HTML parser
-            soup = BeautifulSoup(content, 'lxml')
+        # Pick the parser once from the document head: XHTML has an XML
+        # declaration or the XHTML namespace on its root element. UTF-16/32
+        # documents (BOM or NUL bytes) cannot be sniffed bytewise and go to
+        # the XML parser, which detects their encoding itself.
+        head = content[:1024]
+        if (b'<?xml' in head or b'http://www.w3.org/1999/xhtml' in head
+                or b'\0' in head or head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE))):
+            parser = self.parsers.xml
+        elif self.META_CHARSET_PATTERN.search(head):
+            parser = self.parsers.html
+        else:
+            parser = self.parsers.html_utf8
+        root = etree.fromstring(content, parser=parser)
+        if root is None:
+            return content
         
-        # Find all text nodes and process them
-        for element in soup.find_all(string=True):
-            if element.parent and element.parent.name not in self.SKIP_TAGS:
-                original = str(element)
-                if original.strip():
-                    new_text = self.process_text(original)
-                    if new_text != original:
-                        new_element = BeautifulSoup(new_text, 'html.parser')
-                        element.replace_with(new_element)
+        # <b> always belongs to the document's default (XHTML) namespace, even
+        # under foreign or prefixed elements such as <epub:switch> or <o:p>
+        namespace = root.nsmap.get(None)
+        bold_tag = f'{{{namespace}}}b' if namespace else 'b'
         
-        return str(soup).encode('utf-8')
+        changed = False
+        for text in self.parsers.text_xpath(root):
+            lead, pieces = self.process_text(text)
+            if not pieces:
+                continue
+            changed = True
+            
+            element = text.getparent()
+            parent = element if text.is_text else element.getparent()
+            # New elements are appended to the parent and only need moving
+            # when there is other content after the text node
+            if text.is_text:
+                element.text = lead
+                in_place = len(element) == 0
+            else:
+                element.tail = lead
+                in_place = element.getnext() is None
+            
+            new_elements = []
+            for bold, tail in pieces:
+                # Created inside the document to avoid moving nodes between documents
+                new_element = etree.SubElement(parent, bold_tag)
+                new_element.text = bold
+                new_element.tail = tail
+                new_elements.append(new_element)
+            
+            if in_place:
+                continue
+            if text.is_text:
+                for index, new_element in enumerate(new_elements):
+                    element.insert(index, new_element)
+            else:
+                for new_element in reversed(new_elements):
+                    element.addnext(new_element)
+        
+        # Documents without any words (image pages, navigation by numbers) are kept as-is
+        if not changed:
+            return content
+        
+        # libxml2's HTML parser invents an HTML 4.0 loose DOCTYPE for documents
+        # without one; serializing just the root element leaves it out
+        document = root.getroottree()
+        if parser is not self.parsers.xml and b'<!doctype' not in head.lower():
+            document = root
+        
+        # One pass of libxml2's serializer; documents read with the HTML parser
+        # are written back as XML too, so void elements come out self-closed
+        return etree.tostring(document, encoding='utf-8', method='xml', xml_declaration=True)
+    
+    def _process_html_cached(self, content: bytes, group: tuple[int, int]) -> bytes:
+        """
+        Process HTML/XHTML content from a group of entries sharing a CRC and size,
+        reusing the result for identical documents. The group's results are
+        dropped once its last entry has been processed.
+        """
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        with self._html_cache_lock:
+            result = self._html_cache[group].get(digest)
+        if result is None:
+            result = self.process_html_content(content)
+        
+        with self._html_cache_lock:
+            self._html_cache_remaining[group] -= 1
+            if self._html_cache_remaining[group]:
+                self._html_cache[group][digest] = result
+            else:
+                del self._html_cache[group]
+                del self._html_cache_remaining[group]
+        return result
     
     def convert_epub(self, input_path: str, output_path: str) -> tuple[bool, str]:
         """
@@ -83,22 +289,82 @@ class BionicConverter:
             with zipfile.ZipFile(input_path, 'r') as zip_in:
                 file_list = zip_in.infolist()
                 total_files = len(file_list)
+                html_list = [
+                    file_info for file_info in file_list
+                    if file_info.filename.lower().endswith(self.HTML_EXTENSIONS)
+                ]
+                # Only entries whose CRC and size occur more than once in the central
+                # directory can be duplicates, so only those results are kept for reuse
+                group_sizes = collections.Counter(
+                    (file_info.CRC, file_info.file_size) for file_info in html_list
+                )
+                repeated = {group for group, count in group_sizes.items() if count > 1}
+                with self._html_cache_lock:
+                    self._html_cache = {group: {} for group in repeated}
+                    self._html_cache_remaining = collections.Counter(
+                        {group: group_sizes[group] for group in repeated}
+                    )
+                
+                # Each worker reads through its own handle, so reads never contend
+                worker_inputs = threading.local()
+                opened_inputs = []
+                
+                def convert_file(file_info):
+                    worker_in = getattr(worker_inputs, 'zip_file', None)
+                    if worker_in is None:
+                        worker_in = worker_inputs.zip_file = zipfile.ZipFile(input_path, 'r')
+                        opened_inputs.append(worker_in)
+                    content = worker_in.read(file_info)
+                    group = (file_info.CRC, file_info.file_size)
+                    if group in repeated:
+                        return self._process_html_cached(content, group)
+                    return self.process_html_content(content)
                 
-                with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                    for i, file_info in enumerate(file_list):
-                        with zip_in.open(file_info) as file:
-                            content = file.read()
-                            
-                            # Process HTML/XHTML files
-                            if file_info.filename.lower().endswith(self.HTML_EXTENSIONS):
-                                content = self.process_html_content(content)
-                            
-                            zip_out.writestr(file_info, content)
+                max_workers = min(8, os.cpu_count() or 1)
+                try:
+                    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                        # Process HTML/XHTML files in parallel; lxml releases the GIL while parsing.
+                        # Only a bounded window of files is in flight ahead of the writer,
+                        # so converted documents do not pile up in memory.
+                        html_files = iter(html_list)
+                        pending = collections.deque(
+                            executor.submit(convert_file, file_info)
+                            for file_info in itertools.islice(html_files, self.MAX_PENDING_FILES)
+                        )
                         
-                        # Update progress
-                        if self.progress_callback:
-                            progress = int((i + 1) / total_files * 100)
-                            self.progress_callback(progress, file_info.filename)
+                        last_progress = float('-inf')
+                        with zipfile.ZipFile(output_path, 'w') as zip_out:
+                            # Entries are written in their original order, so mimetype stays first
+                            for i, file_info in enumerate(file_list):
+                                if file_info.filename.lower().endswith(self.HTML_EXTENSIONS):
+                                    content = pending.popleft().result()
+                                    next_file = next(html_files, None)
+                                    if next_file is not None:
+                                        pending.append(executor.submit(convert_file, next_file))
+                                    # Rewritten markup is deflated at the fastest level
+                                    zip_out.writestr(
+                                        copy.copy(file_info), content,
+                                        compress_type=zipfile.ZIP_DEFLATED, compresslevel=1
+                                    )
+                                else:
+                                    # Other entries (images, fonts, CSS) are streamed across in chunks
+                                    # with their original compression (mimetype must stay stored)
+                                    with zip_in.open(file_info) as src, \
+                                            zip_out.open(copy.copy(file_info), 'w') as dst:
+                                        shutil.copyfileobj(src, dst, self.COPY_CHUNK_SIZE)
+                                
+                                # Update progress, at most PROGRESS_INTERVAL apart except for the last file
+                                now = time.monotonic()
+                                is_last = i + 1 == total_files
+                                if self.progress_callback and (
+                                    is_last or now - last_progress >= self.PROGRESS_INTERVAL
+                                ):
+                                    last_progress = now
+                                    progress = int((i + 1) / total_files * 100)
+                                    self.progress_callback(progress, file_info.filename)
+                finally:
+                    for worker_in in opened_inputs:
+                        worker_in.close()
             
             return True, f"Successfully converted to: {output_path}"
             
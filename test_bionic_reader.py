@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the Bionic Reading converter.
+Run with: python -m unittest test_bionic_reader
+"""
+
+import os
+import tempfile
+import unittest
+import zipfile
+
+from bionic_reader import BionicConverter
+
+
+class ProcessTextTest(unittest.TestCase):
+    """Word detection and bolding in plain text."""
+    
+    def setUp(self):
+        self.converter = BionicConverter()
+    
+    def format(self, text):
+        lead, pieces = self.converter.process_text(text)
+        return lead + ''.join(f'<b>{bold}</b>{tail}' for bold, tail in pieces)
+    
+    def test_supplementary_plane_marks(self):
+        """Vowel signs outside the BMP (Brahmi) stay inside their word."""
+        self.assertEqual(self.format('\U00011013\U00011038\U00011013'), '<b>\U00011013</b>\U00011038\U00011013')
+    
+    def test_numerals_are_not_words(self):
+        """Runs with digits, other numerals or underscores are left alone."""
+        for text in ('abc123', 'foo_bar', '2023', 'xyz²', 'Ⅻcd', 'ab‿cd'):
+            self.assertEqual(self.format(text), text)
+
+
+class ProcessHtmlContentTest(unittest.TestCase):
+    """Conversion of single HTML/XHTML documents."""
+    
+    def setUp(self):
+        self.converter = BionicConverter()
+    
+    def test_prefixed_html_element(self):
+        """Word-exported <o:p> in an HTML chapter does not abort the conversion."""
+        content = b'<html><body><p>Hello there<o:p>Some words</o:p></p></body></html>'
+        result = self.converter.process_html_content(content)
+        self.assertIn(b'<o:p><b>So</b>me <b>wo</b>rds</o:p>', result)
+    
+    def test_undeclared_prefix_in_xhtml(self):
+        """Elements with an undeclared prefix in recovered XHTML still get <b> children."""
+        content = (
+            b'<?xml version="1.0" encoding="utf-8"?>'
+            b'<html xmlns="http://www.w3.org/1999/xhtml"><body>'
+            b'<p><foo:bar>inner text</foo:bar></p></body></html>'
+        )
+        result = self.converter.process_html_content(content)
+        self.assertIn(b'<foo:bar><b>in</b>ner <b>te</b>xt</foo:bar>', result)
+    
+    def test_foreign_namespace_parent(self):
+        """<b> stays in the XHTML namespace under epub:* elements."""
+        content = (
+            b'<?xml version="1.0" encoding="utf-8"?>'
+            b'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">'
+            b'<body><epub:switch><epub:default>beta words</epub:default></epub:switch>'
+            b'</body></html>'
+        )
+        result = self.converter.process_html_content(content)
+        self.assertIn(b'<epub:default><b>be</b>ta <b>wo</b>rds</epub:default>', result)
+        self.assertNotIn(b'epub:b', result)
+    
+    def test_utf16_xhtml(self):
+        """UTF-16 content documents are detected and converted."""
+        content = (
+            '<?xml version="1.0" encoding="utf-16"?>'
+            '<html xmlns="http://www.w3.org/1999/xhtml"><body><p>Hello café</p></body></html>'
+        ).encode('utf-16')
+        result = self.converter.process_html_content(content)
+        self.assertIn('<p><b>He</b>llo <b>ca</b>fé</p>'.encode('utf-8'), result)
+    
+    def test_html_declared_charset(self):
+        """A <meta> charset in an HTML chapter is honoured."""
+        content = (
+            '<html><head><meta charset="iso-8859-1"></head>'
+            '<body><p>Hello café</p></body></html>'
+        ).encode('latin-1')
+        result = self.converter.process_html_content(content)
+        self.assertIn('<b>ca</b>fé'.encode('utf-8'), result)
+    
+    def test_html_without_charset_is_utf8(self):
+        """HTML chapters without a declared charset are read as UTF-8."""
+        content = '<html><body><p>Hello café</p></body></html>'.encode('utf-8')
+        result = self.converter.process_html_content(content)
+        self.assertIn('<b>ca</b>fé'.encode('utf-8'), result)
+        
+        # "charset" outside a <meta> declaration (prose, CSS @charset) is not a declaration
+        content = (
+            '<html><head><style>@charset "utf-8";</style></head>'
+            '<body><p>The charset is café</p></body></html>'
+        ).encode('utf-8')
+        result = self.converter.process_html_content(content)
+        self.assertIn('<b>ca</b>fé'.encode('utf-8'), result)
+    
+    def test_html_without_doctype(self):
+        """HTML chapters without a DOCTYPE do not get the parser's HTML 4.0 one."""
+        content = '<html><body><p>Plain html<br>line é</p></body></html>'.encode('utf-8')
+        result = self.converter.process_html_content(content)
+        self.assertNotIn(b'REC-html40', result)
+        self.assertNotIn(b'<!DOCTYPE', result)
+        self.assertTrue(result.startswith(b"<?xml version='1.0' encoding='utf-8'?>"))
+        self.assertIn('<br/><b>li</b>ne é'.encode('utf-8'), result)
+    
+    def test_html_doctype_is_kept(self):
+        """A DOCTYPE present in an HTML chapter is written back."""
+        content = b'<!DOCTYPE html><html><body><p>Plain html</p></body></html>'
+        result = self.converter.process_html_content(content)
+        self.assertIn(b'<!DOCTYPE html>', result)
+
+
+class ConvertEpubTest(unittest.TestCase):
+    """End-to-end conversion of generated EPUB archives."""
+    
+    CHAPTER = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><body><p>Chapter {} words</p></body></html>'
+    )
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.input_path = os.path.join(self.tmp_dir.name, 'input.epub')
+        self.output_path = os.path.join(self.tmp_dir.name, 'output.epub')
+    
+    def convert(self, converter, entries):
+        """Write (name, data) entries to an EPUB, convert it and return the output entries."""
+        with zipfile.ZipFile(self.input_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for name, data in entries:
+                zip_file.writestr(name, data)
+        success, message = converter.convert_epub(self.input_path, self.output_path)
+        self.assertTrue(success, message)
+        with zipfile.ZipFile(self.output_path) as zip_file:
+            return {name: zip_file.read(name) for name in zip_file.namelist()}
+    
+    def test_repeated_chapters(self):
+        """Identical chapters share one result; same CRC and size with other content does not."""
+        # These two chapters have the same length and the same CRC-32
+        colliding = [self.CHAPTER.format('09685295'), self.CHAPTER.format('12060020')]
+        self.assertEqual(zipfile.crc32(colliding[0].encode()), zipfile.crc32(colliding[1].encode()))
+        converter = BionicConverter()
+        output = self.convert(converter, [
+            ('a.xhtml', colliding[0]),
+            ('b.xhtml', colliding[1]),
+            ('c.xhtml', colliding[0]),
+            ('d.xhtml', self.CHAPTER.format('four')),
+            ('e.xhtml', self.CHAPTER.format('four')),
+        ])
+        
+        self.assertEqual(output['a.xhtml'], output['c.xhtml'])
+        self.assertEqual(output['d.xhtml'], output['e.xhtml'])
+        self.assertIn(b'09685295', output['a.xhtml'])
+        self.assertIn(b'12060020', output['b.xhtml'])
+        self.assertIn(b'<b>fo</b>ur', output['d.xhtml'])
+        self.assertEqual(converter._html_cache, {})
+        self.assertEqual(converter._html_cache_remaining, {})
+    
+    def test_archive_layout(self):
+        """Entry order and compression are kept; passthrough bytes are unchanged; HTML is deflated."""
+        image = os.urandom(4096)
+        css = b'p { margin: 0; }\n' * 50
+        entries = [
+            ('mimetype', b'application/epub+zip', zipfile.ZIP_STORED),
+            ('META-INF/', b'', zipfile.ZIP_STORED),
+            ('META-INF/container.xml', b'<?xml version="1.0"?><container/>', zipfile.ZIP_DEFLATED),
+            ('OEBPS/ch1.xhtml', self.CHAPTER.format('one').encode(), zipfile.ZIP_DEFLATED),
+            ('OEBPS/cover.jpg', image, zipfile.ZIP_STORED),
+            ('OEBPS/ch2.xhtml', self.CHAPTER.format('two').encode(), zipfile.ZIP_STORED),
+            ('OEBPS/style.css', css, zipfile.ZIP_DEFLATED),
+            ('OEBPS/ch3.html', b'<html><body><p>three</p></body></html>', zipfile.ZIP_DEFLATED),
+        ]
+        with zipfile.ZipFile(self.input_path, 'w') as zip_file:
+            for name, data, compress_type in entries:
+                zip_file.writestr(zipfile.ZipInfo(name), data, compress_type=compress_type)
+        
+        success, message = BionicConverter().convert_epub(self.input_path, self.output_path)
+        self.assertTrue(success, message)
+        
+        with zipfile.ZipFile(self.output_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            infos = zip_file.infolist()
+            self.assertEqual([info.filename for info in infos], [name for name, _, _ in entries])
+            for info, (name, data, compress_type) in zip(infos, entries):
+                if name.endswith(('.xhtml', '.html')):
+                    self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED, name)
+                    self.assertIn(b'<b>', zip_file.read(info), name)
+                else:
+                    self.assertEqual(info.compress_type, compress_type, name)
+                    self.assertEqual(zip_file.read(info), data, name)
+            # mimetype must be the first entry, stored, without extra fields
+            self.assertEqual(infos[0].filename, 'mimetype')
+            self.assertEqual(infos[0].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(infos[0].extra, b'')
+            self.assertTrue(infos[1].is_dir())
+
+
+if __name__ == "__main__":
+    unittest.main()